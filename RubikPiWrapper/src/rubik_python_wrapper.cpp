@@ -20,9 +20,11 @@
 #include <opencv2/opencv.hpp>
 
 #include <algorithm>
+#include <cmath>
 #include <memory>
 #include <vector>
 #include <cstring>
+#include <thread>
 
 namespace py = pybind11;
 
@@ -89,55 +91,101 @@ bool tensor_image_dims(const TfLiteTensor *tensor, int *w, int *h, int *c) {
     return true;
 }
 
-// IoU calculation
-inline float calculateIoU(const BoxRect &box1, const BoxRect &box2) {
+inline int boxArea(const BoxRect &box) {
+    return (box.right - box.left) * (box.bottom - box.top);
+}
+
+// IoU > threshold test; areas are precomputed once per candidate by the caller.
+// Compares inter > t * union instead of inter / union > t to avoid the divide.
+inline bool iouExceeds(const BoxRect &box1, int area1,
+                       const BoxRect &box2, int area2, float threshold) {
     const int x1 = std::max(box1.left, box2.left);
     const int y1 = std::max(box1.top, box2.top);
     const int x2 = std::min(box1.right, box2.right);
     const int y2 = std::min(box1.bottom, box2.bottom);
 
-    if (x2 <= x1 || y2 <= y1) return 0.0f;
+    if (x2 <= x1 || y2 <= y1) return false;
 
     const int intersectionArea = (x2 - x1) * (y2 - y1);
-    const int area1 = (box1.right - box1.left) * (box1.bottom - box1.top);
-    const int area2 = (box2.right - box2.left) * (box2.bottom - box2.top);
 
-    return static_cast<float>(intersectionArea) / (area1 + area2 - intersectionArea);
+    return static_cast<float>(intersectionArea) >
+           threshold * static_cast<float>(area1 + area2 - intersectionArea);
 }
 
-// Non-Maximum Suppression
+// Per-frame NMS working storage, kept by the caller so the vectors' capacity
+// is reused across frames
+struct NMSScratch {
+    std::vector<bool> suppressed;
+    std::vector<int> areas;
+};
+
+// Non-Maximum Suppression, per class: candidates are grouped by class id so
+// each greedy pass only scans boxes of its own class
 std::vector<DetectionResult> optimizedNMS(std::vector<DetectionResult> &candidates, 
-                                          float nmsThreshold) {
+                                          float nmsThreshold, NMSScratch &scratch) {
     if (candidates.empty()) return {};
 
     std::sort(candidates.begin(), candidates.end(),
               [](const DetectionResult &a, const DetectionResult &b) {
+                  if (a.id != b.id) return a.id < b.id;
                   return a.confidence > b.confidence;
               });
 
+    const size_t count = candidates.size();
     std::vector<DetectionResult> results;
-    results.reserve(candidates.size() / 4);
-    std::vector<bool> suppressed(candidates.size(), false);
+    results.reserve(count / 4);
+    std::vector<bool> &suppressed = scratch.suppressed;
+    suppressed.assign(count, false);
+
+    std::vector<int> &areas = scratch.areas;
+    areas.resize(count);
+    for (size_t i = 0; i < count; ++i) {
+        areas[i] = boxArea(candidates[i].box);
+    }
+
+    for (size_t begin = 0; begin < count;) {
+        size_t end = begin + 1;
+        while (end < count && candidates[end].id == candidates[begin].id) ++end;
 
-    for (size_t i = 0; i < candidates.size(); ++i) {
-        if (suppressed[i]) continue;
+        for (size_t i = begin; i < end; ++i) {
+            if (suppressed[i]) continue;
 
-        results.push_back(candidates[i]);
-        const auto &currentBox = candidates[i];
+            results.push_back(candidates[i]);
+            const auto &currentBox = candidates[i];
 
-        for (size_t j = i + 1; j < candidates.size(); ++j) {
-            if (suppressed[j] || candidates[j].id != currentBox.id) continue;
+            for (size_t j = i + 1; j < end; ++j) {
+                if (suppressed[j]) continue;
 
-            if (calculateIoU(currentBox.box, candidates[j].box) > nmsThreshold) {
-                suppressed[j] = true;
+                if (iouExceeds(currentBox.box, areas[i], candidates[j].box, areas[j], nmsThreshold)) {
+                    suppressed[j] = true;
+                }
             }
         }
+        begin = end;
     }
 
+    // Keep the highest-confidence-first output order across classes
+    std::sort(results.begin(), results.end(),
+              [](const DetectionResult &a, const DetectionResult &b) {
+                  return a.confidence > b.confidence;
+              });
+
     return results;
 }
 
-cv::Mat letterbox(const cv::Mat& img, int target_size = 640) {
+// Placement of the image inside the letterboxed canvas, used to map model
+// coordinates back to image coordinates: x_img = (x_model - left) / scale
+struct LetterboxInfo {
+    float scale;
+    int left;
+    int top;
+};
+
+// Letterbox img into dst, a preallocated square target_size x target_size
+// canvas of the same type: the resize writes straight into the centered ROI
+// and only the padding bands are cleared, so nothing is allocated per frame
+LetterboxInfo letterbox(const cv::Mat& img, cv::Mat& dst) {
+    const int target_size = dst.cols;
     int original_h = img.rows;
     int original_w = img.cols;
 
@@ -147,21 +195,25 @@ cv::Mat letterbox(const cv::Mat& img, int target_size = 640) {
     int new_w = static_cast<int>(original_w * scale);
     int new_h = static_cast<int>(original_h * scale);
 
-    // Resize the image
-    cv::Mat resized;
-    cv::resize(img, resized, cv::Size(new_w, new_h));
-
-    // Create a square black image
-    cv::Mat output = cv::Mat::zeros(cv::Size(target_size, target_size), img.type());
-
     // Compute top-left corner to place the resized image
     int top = (target_size - new_h) / 2;
     int left = (target_size - new_w) / 2;
 
-    // Copy resized image into the square canvas
-    resized.copyTo(output(cv::Rect(left, top, new_w, new_h)));
-
-    return output;
+    // Clear the padding around the image
+    const cv::Scalar black = cv::Scalar::all(0);
+    dst.rowRange(0, top).setTo(black);
+    dst.rowRange(top + new_h, target_size).setTo(black);
+    dst(cv::Rect(0, top, left, new_h)).setTo(black);
+    dst(cv::Rect(left + new_w, top, target_size - left - new_w, new_h)).setTo(black);
+
+    // Resize the image into the canvas. Area averaging for downscales avoids
+    // aliasing and has a fast path for the integer factors camera modes give
+    // (1280x720 -> 640 is exactly 2x); bilinear otherwise
+    cv::Mat roi = dst(cv::Rect(left, top, new_w, new_h));
+    const int interpolation = scale < 1.0f ? cv::INTER_AREA : cv::INTER_LINEAR;
+    cv::resize(img, roi, roi.size(), 0, 0, interpolation);
+
+    return {scale, left, top};
 }
 
 // Main RubikDetector class
@@ -171,11 +223,28 @@ private:
     TfLiteDelegate *delegate;
     TfLiteModel *model;
     bool use_delegate;
+    cv::Mat rgb_scratch;  // reused RGB conversion buffer for same-size float inputs
+    cv::Mat letterbox_scratch;  // reused uint8 letterbox canvas for float inputs
+    std::vector<DetectionResult> candidates;  // reused score-filtered candidates
+    NMSScratch nms_scratch;
+
+    // Tensor handles, input dims and output quantization are fixed once the
+    // tensors are allocated, so they are resolved in the constructor
+    TfLiteTensor *input_tensor;
+    const TfLiteTensor *boxes_tensor;
+    const TfLiteTensor *scores_tensor;
+    const TfLiteTensor *classes_tensor;
+    int in_w, in_h, in_c;
+    TfLiteQuantizationParams boxes_params;
+    TfLiteQuantizationParams scores_params;
 
 public:
-    RubikDetector(const std::string& model_path, bool use_qnn_delegate = true) 
+    RubikDetector(const std::string& model_path, bool use_qnn_delegate = true,
+                  int num_threads = 0) 
         : interpreter(nullptr), delegate(nullptr), model(nullptr), 
-          use_delegate(use_qnn_delegate) {
+          use_delegate(use_qnn_delegate), input_tensor(nullptr),
+          boxes_tensor(nullptr), scores_tensor(nullptr), classes_tensor(nullptr),
+          in_w(0), in_h(0), in_c(0) {
         
         // Load model
         model = TfLiteModelCreateFromFile(model_path.c_str());
@@ -191,6 +260,13 @@ public:
             throw std::runtime_error("Failed to create interpreter options");
         }
 
+        // Ops the HTP delegate does not claim run on the CPU kernels, which
+        // are single-threaded unless told otherwise; 0 means every core
+        if (num_threads <= 0) {
+            num_threads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+        }
+        TfLiteInterpreterOptionsSetNumThreads(interpreterOpts, num_threads);
+
         // Optionally create and add delegate
         if (use_delegate) {
             TfLiteExternalDelegateOptions delegateOptsValue =
@@ -235,6 +311,19 @@ public:
             throw std::runtime_error("Failed to allocate tensors");
         }
 
+        input_tensor = TfLiteInterpreterGetInputTensor(interpreter, 0);
+        if (!input_tensor || !tensor_image_dims(input_tensor, &in_w, &in_h, &in_c)) {
+            TfLiteInterpreterDelete(interpreter);
+            if (delegate) TfLiteExternalDelegateDelete(delegate);
+            TfLiteModelDelete(model);
+            throw std::runtime_error("Invalid input tensor shape");
+        }
+        boxes_tensor = TfLiteInterpreterGetOutputTensor(interpreter, 0);
+        scores_tensor = TfLiteInterpreterGetOutputTensor(interpreter, 1);
+        classes_tensor = TfLiteInterpreterGetOutputTensor(interpreter, 2);
+        boxes_params = TfLiteTensorQuantizationParams(boxes_tensor);
+        scores_params = TfLiteTensorQuantizationParams(scores_tensor);
+
         DEBUG_PRINT("INFO: TensorFlow Lite initialization completed successfully\n");
     }
 
@@ -251,74 +340,95 @@ public:
         // Get image info
         py::buffer_info buf = image.request();
         
-        if (buf.ndim != 3) {
-            throw std::runtime_error("Image must be 3-dimensional (H, W, C)");
+        if (buf.ndim != 3 || buf.shape[2] != 3) {
+            throw std::runtime_error("Image must be 3-dimensional (H, W, 3)");
         }
 
         int img_h = buf.shape[0];
         int img_w = buf.shape[1];
-        int img_c = buf.shape[2];
 
-        // Get input tensor dimensions
-        TfLiteTensor *input = TfLiteInterpreterGetInputTensor(interpreter, 0);
-        int in_w, in_h, in_c;
-        if (!tensor_image_dims(input, &in_w, &in_h, &in_c)) {
-            throw std::runtime_error("Invalid input tensor shape");
-        }
-    
+        // Everything below works on raw buffers, so let other Python threads
+        // (depth stage, stream encoders) run during pre-processing, inference
+        // and NMS. Declared after buf so the GIL is back before buf releases
+        // its Python buffer.
+        py::gil_scoped_release release;
 
-        // Convert BGR to RGB if needed (assuming input is BGR like OpenCV)
+        // Convert BGR to RGB (assuming input is BGR like OpenCV) straight into
+        // the input tensor's buffer: a Mat header over it of matching size and
+        // type is written in place, so no intermediate image or memcpy is needed
         cv::Mat img_mat(img_h, img_w, CV_8UC3, buf.ptr);
-        cv::Mat rgb;
-        cv::cvtColor(img_mat, rgb, cv::COLOR_BGR2RGB);
-        if (img_w != in_w || img_h != in_h) {
-            img_mat = letterbox(rgb, in_w);
+        const bool same_size = img_w == in_w && img_h == in_h;
+        LetterboxInfo placement{1.0f, 0, 0};
+        if (TfLiteTensorType(input_tensor) == kTfLiteFloat32) {
+            // uint8 -> float and the 1/255 scale happen in one convertTo pass
+            cv::Mat input_mat(in_h, in_w, CV_32FC3, TfLiteTensorData(input_tensor));
+            if (same_size) {
+                cv::cvtColor(img_mat, rgb_scratch, cv::COLOR_BGR2RGB);
+                rgb_scratch.convertTo(input_mat, CV_32F, 1.0 / 255.0);
+            } else {
+                // Letterbox first so the channel swap runs in place on the
+                // model-sized canvas rather than as a pass over the full frame
+                letterbox_scratch.create(in_h, in_w, CV_8UC3);
+                placement = letterbox(img_mat, letterbox_scratch);
+                cv::cvtColor(letterbox_scratch, letterbox_scratch, cv::COLOR_BGR2RGB);
+                letterbox_scratch.convertTo(input_mat, CV_32F, 1.0 / 255.0);
+            }
+        } else {
+            cv::Mat input_mat(in_h, in_w, CV_8UC3, TfLiteTensorData(input_tensor));
+            if (same_size) {
+                cv::cvtColor(img_mat, input_mat, cv::COLOR_BGR2RGB);
+            } else {
+                placement = letterbox(img_mat, input_mat);
+                cv::cvtColor(input_mat, input_mat, cv::COLOR_BGR2RGB);
+            }
         }
 
-        // Copy to input tensor
-        std::memcpy(TfLiteTensorData(input), rgb.data, TfLiteTensorByteSize(input));
-
         // Run inference
         if (TfLiteInterpreterInvoke(interpreter) != kTfLiteOk) {
             throw std::runtime_error("Interpreter invocation failed");
         }
 
-        // Get output tensors
-        const TfLiteTensor *boxesTensor = TfLiteInterpreterGetOutputTensor(interpreter, 0);
-        const TfLiteTensor *scoresTensor = TfLiteInterpreterGetOutputTensor(interpreter, 1);
-        const TfLiteTensor *classesTensor = TfLiteInterpreterGetOutputTensor(interpreter, 2);
+        // Read output tensors
+        const int numBoxes = TfLiteTensorDim(boxes_tensor, 1);
 
-        const TfLiteQuantizationParams boxesParams = TfLiteTensorQuantizationParams(boxesTensor);
-        const TfLiteQuantizationParams scoresParams = TfLiteTensorQuantizationParams(scoresTensor);
+        uint8_t *boxesData = static_cast<uint8_t*>(TfLiteTensorData(boxes_tensor));
+        uint8_t *scoresData = static_cast<uint8_t*>(TfLiteTensorData(scores_tensor));
+        uint8_t *classesData = static_cast<uint8_t*>(TfLiteTensorData(classes_tensor));
 
-        const int numBoxes = TfLiteTensorDim(boxesTensor, 1);
+        // score >= box_threshold  <=>  raw >= zero_point + box_threshold / scale,
+        // so most candidates are rejected on the raw byte without dequantizing.
+        // The bound is floored to stay conservative; survivors get the exact check.
+        int minRawScore = 0;
+        if (scores_params.scale > 0.0f) {
+            const float rawBound = scores_params.zero_point + box_threshold / scores_params.scale;
+            minRawScore = static_cast<int>(std::floor(std::max(0.0f, std::min(rawBound, 256.0f))));
+        }
 
-        uint8_t *boxesData = static_cast<uint8_t*>(TfLiteTensorData(boxesTensor));
-        uint8_t *scoresData = static_cast<uint8_t*>(TfLiteTensorData(scoresTensor));
-        uint8_t *classesData = static_cast<uint8_t*>(TfLiteTensorData(classesTensor));
+        // (raw - zp) * scale folded into raw * scale + offset: one multiply-add
+        // per value instead of a subtract and a multiply through a type switch
+        const float boxScale = boxes_params.scale;
+        const float boxOffset = -boxes_params.zero_point * boxes_params.scale;
+        // Undo the letterbox: boxes come back in model-input coordinates
+        const float invScale = 1.0f / placement.scale;
+        const float padX = static_cast<float>(placement.left);
+        const float padY = static_cast<float>(placement.top);
 
-        std::vector<DetectionResult> candidateResults;
+        candidates.clear();
 
         for (int i = 0; i < numBoxes; ++i) {
+            if (scoresData[i] < minRawScore) continue;
+
             float score = get_dequant_value(scoresData, kTfLiteUInt8, i, 
-                                           scoresParams.zero_point, scoresParams.scale);
+                                           scores_params.zero_point, scores_params.scale);
             if (score < box_threshold) continue;
 
             int classId = classesData[i];
 
-            uint8_t raw_x_1_u8 = boxesData[i * 4 + 0];
-            uint8_t raw_y_1_u8 = boxesData[i * 4 + 1];
-            uint8_t raw_x_2_u8 = boxesData[i * 4 + 2];
-            uint8_t raw_y_2_u8 = boxesData[i * 4 + 3];
-
-            float x1 = get_dequant_value(&raw_x_1_u8, kTfLiteUInt8, 0, 
-                                        boxesParams.zero_point, boxesParams.scale);
-            float y1 = get_dequant_value(&raw_y_1_u8, kTfLiteUInt8, 0, 
-                                        boxesParams.zero_point, boxesParams.scale);
-            float x2 = get_dequant_value(&raw_x_2_u8, kTfLiteUInt8, 0, 
-                                        boxesParams.zero_point, boxesParams.scale);
-            float y2 = get_dequant_value(&raw_y_2_u8, kTfLiteUInt8, 0, 
-                                        boxesParams.zero_point, boxesParams.scale);
+            const uint8_t *raw = boxesData + i * 4;
+            float x1 = (raw[0] * boxScale + boxOffset - padX) * invScale;
+            float y1 = (raw[1] * boxScale + boxOffset - padY) * invScale;
+            float x2 = (raw[2] * boxScale + boxOffset - padX) * invScale;
+            float y2 = (raw[3] * boxScale + boxOffset - padY) * invScale;
 
             float clamped_x1 = std::max(0.0f, std::min(x1, static_cast<float>(img_w)));
             float clamped_y1 = std::max(0.0f, std::min(y1, static_cast<float>(img_h)));
@@ -333,25 +443,46 @@ public:
             box.right = static_cast<int>(std::round(clamped_x2));
             box.bottom = static_cast<int>(std::round(clamped_y2));
 
-            candidateResults.emplace_back(classId, box, score);
+            candidates.emplace_back(classId, box, score);
         }
 
-        return optimizedNMS(candidateResults, static_cast<float>(nms_threshold));
+        return optimizedNMS(candidates, static_cast<float>(nms_threshold), nms_scratch);
+    }
+
+    // Same as detect, but as parallel arrays: boxes (N, 4) int32 as
+    // left/top/right/bottom, scores (N,) float32 and class ids (N,) int32
+    py::tuple detect_arrays(py::array_t<uint8_t> image,
+                            double box_threshold = 0.5,
+                            double nms_threshold = 0.45) {
+        const std::vector<DetectionResult> results = detect(image, box_threshold, nms_threshold);
+        const py::ssize_t n = static_cast<py::ssize_t>(results.size());
+
+        py::array_t<int32_t> boxes(std::vector<py::ssize_t>{n, 4});
+        py::array_t<float> scores(n);
+        py::array_t<int32_t> ids(n);
+        auto b = boxes.mutable_unchecked<2>();
+        auto s = scores.mutable_unchecked<1>();
+        auto c = ids.mutable_unchecked<1>();
+
+        for (py::ssize_t i = 0; i < n; ++i) {
+            const DetectionResult &r = results[i];
+            b(i, 0) = r.box.left;
+            b(i, 1) = r.box.top;
+            b(i, 2) = r.box.right;
+            b(i, 3) = r.box.bottom;
+            s(i) = r.confidence;
+            c(i) = r.id;
+        }
+
+        return py::make_tuple(boxes, scores, ids);
     }
 
     bool is_quantized() {
-        TfLiteTensor *input = TfLiteInterpreterGetInputTensor(interpreter, 0);
-        if (!input) return false;
-        return TfLiteTensorType(input) == kTfLiteUInt8;
+        return TfLiteTensorType(input_tensor) == kTfLiteUInt8;
     }
 
     std::tuple<int, int, int> get_input_shape() {
-        TfLiteTensor *input = TfLiteInterpreterGetInputTensor(interpreter, 0);
-        int w, h, c;
-        if (!tensor_image_dims(input, &w, &h, &c)) {
-            throw std::runtime_error("Failed to get input dimensions");
-        }
-        return std::make_tuple(h, w, c);
+        return std::make_tuple(in_h, in_w, in_c);
     }
 };
 
@@ -383,15 +514,21 @@ PYBIND11_MODULE(rubik_detector, m) {
         });
 
     py::class_<RubikDetector>(m, "RubikDetector")
-        .def(py::init<const std::string&, bool>(),
+        .def(py::init<const std::string&, bool, int>(),
              py::arg("model_path"),
              py::arg("use_qnn_delegate") = true,
+             py::arg("num_threads") = 0,
              "Initialize RubikDetector with model path")
         .def("detect", &RubikDetector::detect,
              py::arg("image"),
              py::arg("box_threshold") = 0.5,
              py::arg("nms_threshold") = 0.45,
              "Detect objects in image. Image should be numpy array (H, W, C) in BGR format.")
+        .def("detect_arrays", &RubikDetector::detect_arrays,
+             py::arg("image"),
+             py::arg("box_threshold") = 0.5,
+             py::arg("nms_threshold") = 0.45,
+             "Detect objects in image, returning (boxes, scores, class_ids) numpy arrays.")
         .def("is_quantized", &RubikDetector::is_quantized,
              "Check if the model is quantized")
         .def("get_input_shape", &RubikDetector::get_input_shape,
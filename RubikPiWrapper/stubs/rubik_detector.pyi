@@ -54,7 +54,7 @@ class DetectionResult:
     def id(self, arg0: typing.SupportsInt) -> None:
         ...
 class RubikDetector:
-    def __init__(self, model_path: str, use_qnn_delegate: bool = True) -> None:
+    def __init__(self, model_path: str, use_qnn_delegate: bool = True, num_threads: typing.SupportsInt = 0) -> None:
         """
         Initialize RubikDetector with model path
         """
@@ -62,6 +62,10 @@ class RubikDetector:
         """
         Detect objects in image. Image should be numpy array (H, W, C) in BGR format.
         """
+    def detect_arrays(self, image: typing.Annotated[numpy.typing.ArrayLike, numpy.uint8], box_threshold: typing.SupportsFloat = 0.5, nms_threshold: typing.SupportsFloat = 0.45) -> tuple:
+        """
+        Detect objects in image, returning (boxes, scores, class_ids) numpy arrays.
+        """
     def get_input_shape(self) -> tuple[int, int, int]:
         """
         Get expected input shape (height, width, channels)
@@ -1,3 +1,6 @@
+import logging
+
+import numpy as np
 from ultralytics import YOLO
 
 import app.core.logging_config as logging_config
@@ -17,6 +20,11 @@ class YOLODetector(DetectorBase):
         self.imgsz = imgsz
         self.results = None
         self.detection_count = 0
+        # Read per frame; kept current by the config listener
+        self.min_confidence = ConfigManager().get().min_confidence
+        ConfigManager().add_listener(self._on_config_update)
+
+        self._warmup()
 
         logger.info(
             f"YOLO detector initialized successfully (imgsz={imgsz})",
@@ -24,14 +32,30 @@ class YOLODetector(DetectorBase):
             status="success",
         )
 
+    def _on_config_update(self, config):
+        self.min_confidence = config.min_confidence
+
+    def _warmup(self):
+        """Run one dummy inference so predictor setup happens at init, not on the first frame."""
+        try:
+            blank = np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8)
+            self.model(blank, imgsz=self.imgsz, verbose=False)
+        except Exception as e:
+            logger.warning(f"YOLO warmup failed: {e}", operation="init")
+
     def detect(self, image):
         """Run detection on an image"""
         if image is None:
             logger.warning("Received None image for detection", operation="detect")
             return
 
+        # Ultralytics prints a per-frame speed line to stdout unless verbose is
+        # off; keep it only when debugging
         self.results = self.model(
-            image, imgsz=self.imgsz, conf=ConfigManager().get().min_confidence
+            image,
+            imgsz=self.imgsz,
+            conf=self.min_confidence,
+            verbose=logger.is_enabled_for(logging.DEBUG),
         )[0]
 
         self.detection_count += 1
@@ -39,7 +63,7 @@ class YOLODetector(DetectorBase):
         # Log periodically
         if self.detection_count % 100 == 0:
             logger.debug(
-                f"Processed {self.detection_count} detections", operation="detect"
+                "Processed %d detections", self.detection_count, operation="detect"
             )
 
     def get_annotated_image(self):
@@ -1,4 +1,3 @@
-import time
 from typing import Callable
 
 import app.core.logging_config as logging_config
@@ -19,10 +18,15 @@ class PipelineRunner(AsyncLoopBase):
             operation="init",
         )
 
+        # Kept current by the config listener so stream toggles apply live
         self.config = ConfigManager().get()
+        ConfigManager().add_listener(self._on_config_update)
         self.pipeline = pipeline
         self.set_output_callback = set_output_callback
         self.latency = -1
+        # Publish the first output even if it is empty, so a pipeline switch
+        # clears what the previous pipeline left behind
+        self._published_generation = -1
         assert set_output_callback, "set_output callback was empty!"
 
         logger.info(
@@ -31,12 +35,18 @@ class PipelineRunner(AsyncLoopBase):
             status="success",
         )
 
+    def _on_config_update(self, config):
+        self.config = config
+
     def on_iteration(self):
         try:
-            start = time.perf_counter()
             self.pipeline.iterate()
-            end = time.perf_counter()
-            self.latency = round(end - start, 2)
+            # The loop outpaces the pipeline; only publish a new result
+            generation = self.pipeline.output_generation
+            if generation == self._published_generation:
+                return
+            self._published_generation = generation
+            self.latency = round(self.pipeline.latency, 2)
 
             output = self.pipeline.get_output()
             try:
@@ -54,7 +64,7 @@ class PipelineRunner(AsyncLoopBase):
 
     def get_color_jpeg(self):
         """Get JPEG-encoded color frame."""
-        if ConfigManager().get().color_frame.stream_enabled:
+        if self.config.color_frame.stream_enabled:
             return self.pipeline.get_color_jpeg()
         return None
 
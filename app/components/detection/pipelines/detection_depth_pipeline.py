@@ -1,8 +1,11 @@
-import asyncio
+import functools
+import os
+import threading
 import time
-import cv2
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import numpy as np
-from pyrealsense2 import rs2_deproject_pixel_to_point
+from pyrealsense2 import distortion, rs2_deproject_pixel_to_point
 
 import app.core.logging_config as logging_config
 from app.components.detection.detector_base import DetectorBase
@@ -10,34 +13,124 @@ from app.components.detection.detector_factory import create_detector
 from app.components.detection.pipelines.pipeline_base import PipelineBase
 from app.config import ConfigManager
 from app.core.uploader import UPLOAD_FOLDER
-from models.detection_model import Detection, Point2d, Point3d
+from models.detection_model import DETECTION_DTYPE
 from utils import drawing_utils
 from utils.utils import frames_to_jpeg_bytes
 
 logger = logging_config.get_logger(__name__)
 
+# Initial capacity of the detection buffers; grown on demand.
+DETECTION_CAPACITY = 64
+
+# Distortion models that reduce to a pinhole when all coefficients are zero.
+PINHOLE_MODELS = (
+    distortion.none,
+    distortion.brown_conrady,
+    distortion.inverse_brown_conrady,
+)
+
+# Minimum seconds between repeats of the per-iteration "no frame" error.
+NO_FRAME_LOG_INTERVAL = 1.0
+
+# Stand-in for invalid (zero) depth pixels so they sort last. 65535 is itself
+# a valid reading; such a tie can only pick a pixel of the same depth value.
+DEPTH_SENTINEL = np.uint16(np.iinfo(np.uint16).max)
+
+NO_BOXES = np.empty((0, 4), dtype=np.int32)
+
+
+def _model_mtime(model_path: str) -> float:
+    """Newest modification time of a model file or model directory."""
+    try:
+        mtime = os.path.getmtime(model_path)
+        if os.path.isdir(model_path):
+            with os.scandir(model_path) as entries:
+                mtime = max([mtime, *(e.stat().st_mtime for e in entries)])
+        return mtime
+    except OSError:
+        return 0.0
+
+
+def _get_detector(model_path: str, imgsz: int) -> tuple[DetectorBase, threading.Lock]:
+    """Load a detector once per model version and share it between pipelines."""
+    # The mtime is part of the key so a re-uploaded model loads fresh weights
+    return _load_detector(model_path, imgsz, _model_mtime(model_path))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_detector(
+    model_path: str, imgsz: int, mtime: float
+) -> tuple[DetectorBase, threading.Lock]:
+    return create_detector(model_path, imgsz=imgsz), threading.Lock()
+
 
 class DetectionDepthPipeline(PipelineBase):
     name = "DetectionDepthPipeline"
 
+    @classmethod
+    def preload(cls, model_path):
+        _get_detector(
+            f"./{UPLOAD_FOLDER}/{model_path}", ConfigManager().get().image_size
+        )
+
     def __init__(self, camera, model_path):
         self.camera = camera
         model_path = f"./{UPLOAD_FOLDER}/{model_path}"
-        self.detections: list[Detection] = []
+        # Two preallocated buffers: the depth stage fills one while readers
+        # (stream handlers, publisher) keep a view of the other.
+        self._det_bufs = [
+            np.empty(DETECTION_CAPACITY, dtype=DETECTION_DTYPE) for _ in range(2)
+        ]
+        self._no_detections = np.empty(0, dtype=DETECTION_DTYPE)
+        self.detections: np.ndarray = self._no_detections
+        # (colour frame, boxes, detections) of one frame, published together so
+        # the colour stream draws on the image the detections came from
+        self._color_view = (None, NO_BOXES, self._no_detections)
         config = ConfigManager().get()
-        self.detector: DetectorBase = create_detector(
-            model_path, imgsz=config.image_size
+        self.detector, self._detector_lock = _get_detector(
+            model_path, config.image_size
+        )
+        # Inference runs on its own thread so the loop keeps serving frames
+        # while it runs; at most one detection is in flight at a time.
+        self._detector_stage = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="detector"
         )
+        self._pending: tuple[int, Future, object, object, float] | None = None
+        # Depth intrinsics are fixed per stream profile; resolved on first frame
+        self._intrinsics = None
+        self._intrinsics_shape = None
+        self._ray_x = None
+        self._ray_y = None
+        # Run the detector every Nth frame; in between, the last boxes are
+        # re-measured against the fresh depth frame.
+        self._detect_every = max(1, config.detect_every)
+        ConfigManager().add_listener(self._on_config_update)
+        self._frame_ctr = 0
+        self._last_frame_number = -1
+        self._published_frame_number = -1
+        self._last_bboxs = None
+        self._last_no_frame_log = 0.0
+
+    def _on_config_update(self, config):
+        self._detect_every = max(1, config.detect_every)
 
     def get_color_jpeg(self):
         """Get JPEG-encoded annotated image."""
-        detected = self.detector.get_annotated_image()
-        if detected is None:
+        frame, boxes, detections = self._color_view
+        if frame is None:
             return None
+        detected = frame.copy()
 
-        drawing_utils.annotate_detections(
-            detected, self.detections, lambda det: str(det.point)
-        )
+        drawing_utils.draw_boxes(detected, boxes)
+        labels = [
+            f"({x:.2f},{y:.2f},{z:.2f})"
+            for x, y, z in zip(
+                detections["x"].tolist(),
+                detections["y"].tolist(),
+                detections["z"].tolist(),
+            )
+        ]
+        drawing_utils.annotate_detections(detected, detections, labels)
         return frames_to_jpeg_bytes(
             detected, resolution=(self.camera.width, self.camera.height)
         )
@@ -47,78 +140,174 @@ class DetectionDepthPipeline(PipelineBase):
         depth_frame = self.camera.latest_depth_frame
         if depth_frame is None:
             return None
+        # The camera hands out a cached frame; draw on a private copy
+        depth_frame = depth_frame.copy()
 
-        drawing_utils.annotate_detections(
-            depth_frame, self.detections, lambda det: f"{det.depth:.2f}m"
-        )
+        detections = self.detections
+        labels = [f"{depth:.2f}m" for depth in detections["depth"].tolist()]
+        drawing_utils.annotate_detections(depth_frame, detections, labels)
 
         return frames_to_jpeg_bytes(
             depth_frame, resolution=(self.camera.width, self.camera.height)
         )
 
+    def _detect(self, frame):
+        """Detector stage: run inference and return the raw bounding boxes."""
+        with self._detector_lock:
+            self.detector.detect(frame)
+            detections = self.detector.get_detections()
+        # Empty frames skip the depth stage's per-frame work entirely
+        if not detections or detections[0] is None or not len(detections[0]):
+            return None
+        return detections[0]
+
     def iterate(self):
         """Main detection loop with error handling."""
+        frame_number = self.camera.frame_count
         frame = self.camera.latest_frame
         depth_frame = self.camera.latest_depth_data
+        capture_time = self.camera.frame_time
 
         if frame is None or depth_frame is None:
-            logger.error("Camera frame is None!")
-            self.detections = []
+            # Runs at loop rate while the camera is down; log at most once
+            # per interval instead of once per iteration
+            now = time.monotonic()
+            if now - self._last_no_frame_log >= NO_FRAME_LOG_INTERVAL:
+                logger.error("Camera frame is None!", operation="iterate")
+                self._last_no_frame_log = now
+            if self.detections is not self._no_detections:
+                self.detections = self._no_detections
+                self.output_generation += 1
             return
 
-        self.detector.detect(frame)
-        detections = self.detector.get_detections()
+        # Publish a finished detection as soon as it lands
+        pending = self._pending
+        if pending is not None and pending[1].done():
+            self._pending = None
+            self._finish(*pending)
 
-        if not detections or detections[0] is None:
-            self.detections = []
+        # The loop outpaces the camera; only a new frame advances the cadence
+        if frame_number == self._last_frame_number:
             return
+        skip = (
+            self._frame_ctr % self._detect_every != 0 and self._last_bboxs is not None
+        )
+        if not skip:
+            if self._pending is not None:
+                # Detector busy: leave the frame rather than queue it, so the
+                # next inference starts on whatever frame is newest by then
+                return
+            future = self._detector_stage.submit(self._detect, frame)
+            self._pending = (frame_number, future, frame, depth_frame, capture_time)
+        else:
+            # No inference needed; re-measure the last boxes right away
+            self._finish(frame_number, None, frame, depth_frame, capture_time)
+        self._last_frame_number = frame_number
+        self._frame_ctr += 1
+
+    def _finish(self, frame_number, future, frame, depth_frame, capture_time):
+        """Take the boxes of one frame, run its depth stage and publish it."""
+        if future is None:
+            bboxs = self._last_bboxs
+        else:
+            bboxs = self._last_bboxs = future.result()
+            if frame_number < self._published_frame_number:
+                # Skipped frames newer than this one are already out; the
+                # result only refreshes the boxes later frames reuse
+                return
+        self._published_frame_number = frame_number
+        if bboxs is None:
+            self.detections = self._no_detections
+            self._color_view = (frame, NO_BOXES, self._no_detections)
+        else:
+            self._locate_detections(bboxs, frame, depth_frame)
+        self.latency = time.monotonic() - capture_time
+        self.output_generation += 1
 
-        bboxs = detections[0]
+    def _locate_detections(self, bboxs, frame, depth_frame):
+        """Depth stage: resolve a 3D point for every bounding box."""
         depth_mat = np.asanyarray(depth_frame.get_data())
         height, width = depth_mat.shape
-        intrinsics = depth_frame.profile.as_video_stream_profile().get_intrinsics()
-        self.detections = []
+        if self._intrinsics_shape != depth_mat.shape:
+            self._load_intrinsics(depth_frame, width, height)
+        intrinsics, ray_x, ray_y = self._intrinsics, self._ray_x, self._ray_y
+        bboxes = np.asarray(bboxs).astype(np.int32)
+        np.clip(
+            bboxes, 0, [width - 1, height - 1, width - 1, height - 1], out=bboxes
+        )
 
-        def clamp(val, min_val, max_val):
-            return max(min_val, min(val, max_val))
+        buf = self._det_bufs[0]
+        if len(buf) < len(bboxes):
+            buf = np.empty(max(len(bboxes), 2 * len(buf)), dtype=DETECTION_DTYPE)
+        count = 0
 
-        for bbox in bboxs:
+        for x_min, y_min, x_max, y_max in bboxes.tolist():
             try:
-                x_min, y_min, x_max, y_max = map(int, bbox)
-                x_min, x_max = clamp(x_min, 0, width - 1), clamp(x_max, 0, width - 1)
-                y_min, y_max = clamp(y_min, 0, height - 1), clamp(y_max, 0, height - 1)
-
                 center_x, center_y = (x_min + x_max) // 2, (y_min + y_max) // 2
 
                 depth_crop = depth_mat[y_min:y_max, x_min:x_max]
-                mask = depth_crop != 0
-
-                if np.any(mask):
-                    valid_depths = depth_crop[mask]
-                    median_idx = np.argsort(valid_depths)[len(valid_depths) // 2]
-                    # Get coordinates of the median depth pixel
-                    mask_coords = np.argwhere(mask)
-                    median_y_local, median_x_local = mask_coords[median_idx]
+                valid_crop = depth_crop != 0
+                valid_count = np.count_nonzero(valid_crop)
+
+                if valid_count:
+                    # Zeros become a sentinel that sorts last, so the median
+                    # rank lands on a valid pixel without a masked copy
+                    depth_crop = np.where(valid_crop, depth_crop, DEPTH_SENTINEL)
+                    # Selection, not a full sort: only the median rank is needed
+                    median_rank = valid_count // 2
+                    median_flat = np.argpartition(depth_crop, median_rank, axis=None)[
+                        median_rank
+                    ]
+                    median_y_local, median_x_local = divmod(
+                        int(median_flat), x_max - x_min
+                    )
                     median_x, median_y = x_min + median_x_local, y_min + median_y_local
-                    median_value_mm = depth_mat[median_y, median_x]
+                    median_value_mm = depth_crop[median_y_local, median_x_local]
                 else:
                     median_x, median_y = center_x, center_y
                     median_value_mm = 0
 
                 depth_meters = median_value_mm / 1000.0
-                point = rs2_deproject_pixel_to_point(
-                    intrinsics, [median_x, median_y], depth_meters
-                )
-                y, z, x = point
-                self.detections.append(
-                    Detection(
-                        Point3d(x, y, z), Point2d(center_x, center_y), depth_meters
+                if ray_x is not None:
+                    point = (
+                        ray_x[median_x] * depth_meters,
+                        ray_y[median_y] * depth_meters,
+                        depth_meters,
                     )
-                )
+                else:
+                    point = rs2_deproject_pixel_to_point(
+                        intrinsics, [median_x, median_y], depth_meters
+                    )
+                y, z, x = point
+                buf[count] = (x, y, z, center_x, center_y, depth_meters)
+                count += 1
             except Exception as e:
                 logger.warning(
                     f"Error processing detection bbox: {e}", operation="loop"
                 )
 
-    def get_output(self) -> list[Detection]:
+        # Publish the filled buffer and write into the other one next frame
+        self._det_bufs = [self._det_bufs[1], buf]
+        self.detections = buf[:count]
+        self._color_view = (frame, bboxes, self.detections)
+
+    def _load_intrinsics(self, depth_frame, width, height):
+        """Cache the depth intrinsics and, for pinhole models, per-pixel ray tables."""
+        intrinsics = depth_frame.profile.as_video_stream_profile().get_intrinsics()
+        self._intrinsics = intrinsics
+        self._intrinsics_shape = (height, width)
+        if intrinsics.model in PINHOLE_MODELS and not any(intrinsics.coeffs):
+            # Deprojection is then (u - ppx) / fx * depth, (v - ppy) / fy * depth
+            self._ray_x = ((np.arange(width) - intrinsics.ppx) / intrinsics.fx).tolist()
+            self._ray_y = ((np.arange(height) - intrinsics.ppy) / intrinsics.fy).tolist()
+        else:
+            self._ray_x = self._ray_y = None
+
+    def close(self):
+        """Stop the detector stage and drop the frame still in flight."""
+        self._detector_stage.shutdown(wait=True, cancel_futures=True)
+        self._pending = None
+
+    def get_output(self) -> np.ndarray:
+        """Detections of the latest frame as a DETECTION_DTYPE structured array."""
         return self.detections
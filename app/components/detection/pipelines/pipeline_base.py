@@ -1,27 +1,36 @@
 from __future__ import annotations
 
+import functools
+import importlib
 from abc import abstractmethod
 
 from app.components.detection.realsense_camera import RealSenseCamera
 from app.core import logging_config
 from models.models import Pipeline
 
-# Registry dictionary
-PIPELINE_REGISTRY: dict[str, type[PipelineBase]] = {}
+# Pipeline name -> "module:Class"; modules are imported only when selected
+PIPELINE_REGISTRY: dict[str, str] = {
+    "RegularPipeline": "app.components.detection.pipelines.regular_pipeline:RegularPipeline",
+    "DetectionDepthPipeline": "app.components.detection.pipelines.detection_depth_pipeline:DetectionDepthPipeline",
+}
 logger = logging_config.get_logger(__name__)
 
 
 class PipelineBase:
-    def __init_subclass__(cls, **kwargs):
-        """Automatically register subclasses by their 'name' property."""
-        super().__init_subclass__(**kwargs)
-        try:
-            PIPELINE_REGISTRY[getattr(cls, "name")] = cls
-        except AttributeError:
-            logger.warning(
-                f"Pipeline {cls.__name__} doesn't have a name attribute, registering by module __name__"
-            )
-            PIPELINE_REGISTRY[cls.__name__] = cls
+    # Whether the pipeline reads depth in color-frame coordinates
+    needs_aligned_depth = True
+    # Bumped each time get_output changes; the runner publishes only on a bump
+    output_generation = 0
+    # Seconds from frame capture to the latest output, or -1 if not measured
+    latency = -1.0
+
+    @classmethod
+    def preload(cls, *args) -> None:
+        """Load heavy resources (e.g. model weights) ahead of construction.
+
+        Called with the pipeline's config args while the camera starts up, so
+        the constructor later finds them cached. No-op by default.
+        """
 
     @abstractmethod
     def get_color_jpeg(self) -> bytes | None:
@@ -39,15 +48,27 @@ class PipelineBase:
     def iterate(self):
         raise NotImplementedError()
 
+    def close(self) -> None:
+        """Release threads or other resources; called once the runner has stopped."""
+
+
+@functools.lru_cache(maxsize=None)
+def get_pipeline_class(name: str) -> type[PipelineBase] | None:
+    """Resolve a registered pipeline name to its class, importing it once."""
+    try:
+        module_path, cls_name = PIPELINE_REGISTRY[name].split(":")
+    except KeyError:
+        return None
+    return getattr(importlib.import_module(module_path), cls_name)
+
 
 def create_pipeline_by_name(
     pipeline: Pipeline, camera: RealSenseCamera
 ) -> PipelineBase | None:
-    try:
-        cls = PIPELINE_REGISTRY[pipeline.type]
-        return cls(camera, *pipeline.args)
-    except KeyError:
+    cls = get_pipeline_class(pipeline.type)
+    if cls is None:
         return None
+    return cls(camera, *pipeline.args)
 
 
 def get_all_pipeline_names() -> list[str]:
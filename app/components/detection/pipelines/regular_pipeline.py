@@ -7,19 +7,20 @@ logger = logging_config.get_logger(__name__)
 
 class RegularPipeline(PipelineBase):
     name = "RegularPipeline"
+    needs_aligned_depth = False
 
     def __init__(self, camera):
         super().__init__()
         logger.info("Initializing RegularPipeline", operation="init")
         self.camera = camera
         self.frame = None
-        self.depth_frame = None
         logger.info("RegularPipeline initialized", operation="init", status="success")
 
     def iterate(self):
         """Main processing loop."""
+        # The depth frame is colorized on demand in get_depth_jpeg, so headless
+        # runs never pay for it
         self.frame = self.camera.latest_frame
-        self.depth_frame = self.camera.latest_depth_frame
 
     def _convert_to_jpeg(self, frame):
         if frame is None:
@@ -30,7 +31,7 @@ class RegularPipeline(PipelineBase):
 
     def get_depth_jpeg(self):
         """Get JPEG-encoded depth frame."""
-        return self._convert_to_jpeg(self.depth_frame)
+        return self._convert_to_jpeg(self.camera.latest_depth_frame)
 
     def get_color_jpeg(self):
         """Get JPEG-encoded color frame."""
@@ -28,19 +28,39 @@ class RealSenseCamera(AsyncLoopBase):
 
         # State variables
         self.pipeline = None
+        self._frame_queue = None
         self.align = None
+        # Pipelines that never read depth in color-frame coordinates turn this
+        # off to skip the full-frame align pass
+        self.align_depth = True
         self._latest_frame = None
         self._latest_depth_frame = None
         self._latest_depth_data = None
         self.frame_count = 0
+        # time.monotonic() at which the latest frameset arrived
+        self.frame_time = 0.0
+        self._colorized_frame_count = -1
+        self._last_frame_time = time.monotonic()
 
         # Filter placeholders
         self.spatial = None
         self.temporal = None
         self.hole_filling = None
+        self._filters = ()
 
         self.color_map = rs.colorizer()
 
+        # One context for the camera's lifetime; the device count is refreshed
+        # by librealsense's hotplug callback instead of re-enumerating USB
+        self._ctx = None
+        self._device_count = 0
+        try:
+            self._ctx = rs.context()
+            self._device_count = len(self._ctx.query_devices())
+            self._ctx.set_devices_changed_callback(self._on_devices_changed)
+        except Exception as e:
+            logger.error(f"Failed to create RealSense context: {e}", operation="init")
+
         # Attempt initialization
         try:
             if self.is_connected():
@@ -57,12 +77,18 @@ class RealSenseCamera(AsyncLoopBase):
 
     def is_connected(self) -> bool:
         """Check if any device is connected"""
+        return self._device_count > 0
+
+    def _on_devices_changed(self, info):
+        """Hotplug callback: refresh the cached device count."""
         try:
-            ctx = rs.context()
-            devices = ctx.query_devices()
-            return len(devices) > 0
+            self._device_count = len(self._ctx.query_devices())
         except Exception:
-            return False
+            self._device_count = 0
+        logger.info(
+            f"RealSense devices changed ({self._device_count} connected)",
+            operation="hotplug",
+        )
 
     def _load_config_onto_device(self, device, file: Path = Path("camera_config.json")):
         """
@@ -101,6 +127,11 @@ class RealSenseCamera(AsyncLoopBase):
         if filters_config.hole_filling.enabled:
             self.hole_filling = rs.hole_filling_filter()
 
+        # Enabled filters in processing order, resolved once
+        self._filters = tuple(
+            f for f in (self.spatial, self.temporal, self.hole_filling) if f
+        )
+
         logger.debug(
             f"Filters initialized: Spatial={bool(self.spatial)}, Temporal={bool(self.temporal)}",
             operation="init_pipeline",
@@ -112,8 +143,7 @@ class RealSenseCamera(AsyncLoopBase):
             "Initializing RealSense pipeline sequence", operation="init_pipeline"
         )
 
-        ctx = rs.context()
-        devices = ctx.query_devices()
+        devices = self._ctx.query_devices() if self._ctx else []
         if not devices:
             raise RuntimeError("Lost device after reset sequence.")
 
@@ -136,25 +166,25 @@ class RealSenseCamera(AsyncLoopBase):
         self.align = rs.align(rs.stream.color)
         self._setup_filters()
 
+        # Acquisition runs on librealsense's own thread and only ever keeps the
+        # newest frameset; this loop consumes it and does align/filters.
+        self._frame_queue = rs.frame_queue(1, keep_frames=True)
+
         # Start Pipeline
         logger.info("Starting RealSense pipeline...", operation="init_pipeline")
         try:
-            profile = self.pipeline.start(rs_config)
+            profile = self.pipeline.start(rs_config, self._frame_queue)
 
             time.sleep(1)
 
             depth_sensor = profile.get_device().first_depth_sensor()
             try:
                 depth_sensor.set_option(rs.option.visual_preset, 3)
-<<<<<<< feature/rubik-pi-support
-                depth_sensor.set_option(rs.option.laser_power, 360)
-=======
                 depth_sensor.set_option(rs.option.enable_auto_exposure, 1)
-                depth_sensor.set_option(rs.option.laser_power, 150)
+                depth_sensor.set_option(rs.option.laser_power, 360)
                 depth_sensor.set_option(rs.option.emitter_enabled, 1)
                 depth_sensor.set_option(rs.option.gain, 16)
                 depth_sensor.set_option(rs.option.depth_units, 0.001)
->>>>>>> main
             except Exception as e:
                 logger.error(
                     f"Exception while loading preset config onto camera: {e}",
@@ -162,10 +192,11 @@ class RealSenseCamera(AsyncLoopBase):
                 )
 
             logger.info("Loading preset config onto camera...")
+            self._apply_color_exposure(profile.get_device())
 
             # Warmup: Discard first few frames to allow auto-exposure to settle
             for _ in range(5):
-                self.pipeline.wait_for_frames(timeout_ms=1000)
+                self._frame_queue.wait_for_frame(1000)
 
             logger.info(
                 "RealSense pipeline started and warmed up.",
@@ -180,6 +211,30 @@ class RealSenseCamera(AsyncLoopBase):
                 )
             raise e
         
+    def _apply_color_exposure(self, device):
+        """Apply color sensor exposure settings from the app config."""
+        exposure_config = self.config.camera.color_exposure
+        try:
+            color_sensor = device.first_color_sensor()
+            color_sensor.set_option(
+                rs.option.enable_auto_exposure, int(exposure_config.auto)
+            )
+            if exposure_config.auto:
+                # Priority 0 holds the configured FPS in low light; 1 (the SDK
+                # default) lets auto exposure drop frames to brighten the image
+                color_sensor.set_option(
+                    rs.option.auto_exposure_priority,
+                    int(not exposure_config.hold_fps),
+                )
+            else:
+                color_sensor.set_option(rs.option.exposure, exposure_config.exposure)
+                color_sensor.set_option(rs.option.gain, exposure_config.gain)
+        except Exception as e:
+            logger.error(
+                f"Failed to apply color exposure settings: {e}",
+                operation="init_pipeline",
+            )
+
     # Profiling - kernprof -l main.py -> python3 -m line_profiler main.py.lprof
     # @profile
     def on_iteration(self):
@@ -192,27 +247,38 @@ class RealSenseCamera(AsyncLoopBase):
             return
 
         try:
-            # 1. Wait for frames
-            frames = self.pipeline.wait_for_frames(timeout_ms=self.frame_timeout_ms)
+            # 1. Take the newest frameset without blocking; the capacity-1
+            # queue has already dropped anything older
+            frame = self._frame_queue.poll_for_frame()
+            if not frame:
+                self._check_frame_timeout()
+                return
+            if not frame.is_frameset():
+                logger.debug("Skipping non-frameset frame from queue")
+                return
+            frames = frame.as_frameset()
+            arrival = self._last_frame_time = time.monotonic()
 
+            # 2. Apply Filters on the raw depth, before align, so temporal
+            # history is kept in native depth coordinates and align only runs
+            # over the final depth
+            for depth_filter in self._filters:
+                frames = depth_filter.process(frames).as_frameset()
 
-            # 2. Align Depth to Color
-            aligned_frames = self.align.process(frames)
-            color_frame = aligned_frames.get_color_frame()
-            depth_frame = aligned_frames.get_depth_frame()
+            # 3. Align Depth to Color
+            if self.align_depth:
+                frames = self.align.process(frames)
+            color_frame = frames.get_color_frame()
+            depth_frame = frames.get_depth_frame()
 
             if depth_frame is None or color_frame is None:
                 logger.debug("Frames dropped/incomplete")
                 return
 
-            # 3. Apply Filters
-            for filter in (self.spatial, self.temporal, self.hole_filling):
-                if filter:
-                    depth_frame = filter.process(depth_frame)
-
             # 4. Process Data
             self._latest_frame = np.asanyarray(color_frame.get_data())
             self._latest_depth_data = depth_frame.as_depth_frame()
+            self.frame_time = arrival
 
             self.frame_count += 1
 
@@ -222,6 +288,15 @@ class RealSenseCamera(AsyncLoopBase):
             logger.error(f"Error in camera loop: {e}", operation="loop")
 
 
+    def _check_frame_timeout(self):
+        """Warn when no frameset has arrived within frame_timeout_ms."""
+        now = time.monotonic()
+        if (now - self._last_frame_time) * 1000 >= self.frame_timeout_ms:
+            logger.warning(
+                f"No frames received for {self.frame_timeout_ms}ms", operation="loop"
+            )
+            self._last_frame_time = now
+
     @property
     def latest_frame(self):
         """Get the latest color frame."""
@@ -235,11 +310,16 @@ class RealSenseCamera(AsyncLoopBase):
         if self._latest_depth_data is None:
             return DISABLED_STREAM_IMAGE
 
-        # Create visual depth map
+        # Only recolorize when a new depth frame has arrived since last call
+        frame_count = self.frame_count
+        if frame_count == self._colorized_frame_count:
+            return self._latest_depth_frame
+
+        # Create visual depth map; the colorizer already emits 8-bit RGB, so
+        # view its buffer instead of copying it
         colorized_depth = self.color_map.process(self._latest_depth_data)
-        self._latest_depth_frame = np.asanyarray(colorized_depth.get_data()).astype(
-            np.uint8
-        )
+        self._latest_depth_frame = np.asanyarray(colorized_depth.get_data())
+        self._colorized_frame_count = frame_count
 
         return self._latest_depth_frame
 
@@ -260,6 +340,7 @@ class RealSenseCamera(AsyncLoopBase):
                 logger.warning(f"Error stopping pipeline: {e}", operation="stop")
             finally:
                 self.pipeline = None
+                self._frame_queue = None
 
         logger.info("RealSense camera stopped", operation="stop", status="success")
         logger.info(
@@ -2,66 +2,86 @@ import time
 import numpy as np
 import cv2
 from dataclasses import dataclass
-from typing import List
 from app.core import logging_config
 from app.components.detection.detector_base import DetectorBase
 from utils.utils import frames_to_jpeg_bytes
 import rubik_detector as rubik
 
+logger = logging_config.get_logger(__name__)
+
+BOX_COLOR = (0, 255, 0)
+BOX_THICKNESS = 2
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+LABEL_SCALE = 0.5
+LABEL_THICKNESS = 1
+LABEL_OFFSET_Y = 6  # label baseline sits this many pixels above the box
+# Corner order (left, top), (right, top), (right, bottom), (left, bottom) as
+# column indices into a left/top/right/bottom box row
+BOX_CORNERS = [[0, 1], [2, 1], [2, 3], [0, 3]]
+
+NO_BOXES = np.empty((0, 4), dtype=np.int32)
+NO_CONFS = np.empty(0, dtype=np.float32)
+NO_CLASSES = np.empty(0, dtype=np.int32)
+
+
 class RubikPiDetector(DetectorBase):
     def __init__(self, model_path: str):
         self.model = rubik.RubikDetector(model_path, True)
-        self.detections: List[rubik.DetectionResult] = []
+        # Latest result as one immutable snapshot, replaced by a single
+        # assignment so readers on other threads never mix two frames:
+        # (image, boxes (N, 4) int32 as left/top/right/bottom,
+        #  confidences (N,), class ids (N,))
+        self._result = (None, NO_BOXES, NO_CONFS, NO_CLASSES)
+        if not self.model.is_quantized():
+            # Float inputs move 4x the bytes per frame and fall off the HTP's
+            # native uint8 path
+            logger.warning(
+                f"Model {model_path} is not uint8-quantized; export a quantized "
+                "model for full NPU throughput",
+                operation="init",
+            )
 
     def is_quantized(self) -> bool:
         return self.model.is_quantized()
 
     def detect(self, image: np.ndarray, box_thresh=0.8, nms_thresh=0.45):
-        self.last_image = image
-        self.detections: List[rubik.DetectionResult] = self.model.detect(image, box_thresh, nms_thresh)
-        
+        boxes, confs, classes = self.model.detect_arrays(image, box_thresh, nms_thresh)
+        self._result = (image, boxes, confs, classes)
 
     def get_detections(self):
-        if not self.detections:
+        _, boxes, confs, classes = self._result
+        if not len(boxes):
             return None
-
-        boxes = np.array(
-            [
-                [det.box.left, det.box.top, det.box.right, det.box.bottom]
-                for det in self.detections
-            ],
-            dtype=np.float32,
-        )
-        confs = np.array([det.confidence for det in self.detections], dtype=np.float32)
-        classes = np.array([det.id for det in self.detections], dtype=np.int32)
         return boxes, confs, classes
 
-    def get_annotated_image(self):
-        if self.detections is None:
+    def get_annotated_image(self, draw_labels=True):
+        image, boxes, confs, classes = self._result
+        if image is None:
             return None
-        
-        if not self.detections:
-            return self.last_image        
 
-        for det in self.detections:
-            box = det.box
-            cv2.rectangle(
-                self.last_image,
-                (box.left, box.top),
-                (box.right, box.bottom),
-                (0, 255, 0),
-                2,
-            )
-            label = f"{det.id}:{det.confidence:.2f}"
-            cv2.putText(
-                self.last_image,
-                label,
-                (box.left, max(box.top - 6, 0)),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.5,
-                (0, 255, 0),
-                1,
-                cv2.LINE_AA,
-            )
+        # image is the camera's frame and stream clients call this
+        # concurrently; each call draws on its own copy
+        annotated = image.copy()
+
+        if not len(boxes):
+            return annotated
+
+        # All rectangles in one call, as closed 4-point polylines
+        cv2.polylines(annotated, boxes[:, BOX_CORNERS], True, BOX_COLOR, BOX_THICKNESS)
+
+        if draw_labels:
+            for (left, top), class_id, conf in zip(
+                boxes[:, :2].tolist(), classes.tolist(), confs.tolist()
+            ):
+                cv2.putText(
+                    annotated,
+                    f"{class_id}:{conf:.2f}",
+                    (left, max(top - LABEL_OFFSET_Y, 0)),
+                    LABEL_FONT,
+                    LABEL_SCALE,
+                    BOX_COLOR,
+                    LABEL_THICKNESS,
+                    cv2.LINE_AA,
+                )
 
-        return self.last_image
+        return annotated
@@ -5,7 +5,6 @@ import numpy as np
 import app.core.logging_config as logging_config
 from app.components.retry_utils import retry_with_backoff
 from app.config import ConfigManager
-from models.detection_model import Detection
 from utils.utils import singleton
 
 logger = logging_config.get_logger(__name__)
@@ -104,45 +103,45 @@ class NetworkTablesPublisher:
             f"NetworkTables table '{table_name}' acquired", operation="init_connection"
         )
 
+        # Detections carry no orientation; one shared identity rotation
+        self._identity_rotation = Rotation3d()
+
         # Struct array publisher instead of single struct
         self.pose_pub = self.table.getStructArrayTopic("poses", Pose3d).publish()
         logger.debug("Pose publisher created", operation="init_connection")
 
-    def publish_detections(self, detections: list[Detection]):
+    def publish_detections(self, detections: np.ndarray):
         """Publish detection results to NetworkTables with error handling."""
         if not NTCORE:
             return
         try:
-            if not detections:
+            if detections is None or not len(detections):
                 self.clear()
                 return
 
-            poses = []
-            for i, det in enumerate(detections):
-                try:
-                    point = det.point
-                    pose = Pose3d(
-                        Translation3d(point.x, -point.y, -point.z), Rotation3d()
-                    )
-                    poses.append(pose)
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to create pose for detection {i}: {e}",
-                        operation="publish_detections",
-                    )
+            # Float fields can't fail Translation3d; any error here is caught
+            # by the outer handler rather than a try per detection
+            rotation = self._identity_rotation
+            poses = [
+                Pose3d(Translation3d(x, -y, -z), rotation)
+                for x, y, z in zip(
+                    detections["x"].tolist(),
+                    detections["y"].tolist(),
+                    detections["z"].tolist(),
+                )
+            ]
 
             # Publish as struct array
-            if poses:
-                self.pose_pub.set(poses)
-                self.publish_count += 1
-
-                if self.publish_count % 30 == 0:  # Log every 30 publishes
-                    logger.debug(
-                        f"Published {len(poses)} detections (total publishes: {self.publish_count})",
-                        operation="publish_detections",
-                    )
-            else:
-                self.clear()
+            self.pose_pub.set(poses)
+            self.publish_count += 1
+
+            if self.publish_count % 30 == 0:  # Log every 30 publishes
+                logger.debug(
+                    "Published %d detections (total publishes: %d)",
+                    len(poses),
+                    self.publish_count,
+                    operation="publish_detections",
+                )
 
         except Exception as e:
             self.error_count += 1
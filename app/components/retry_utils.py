@@ -48,7 +48,10 @@ def retry_with_backoff(
             for attempt in range(1, max_attempts + 1):
                 try:
                     logger.debug(
-                        f"Attempting {func.__name__} (attempt {attempt}/{max_attempts})",
+                        "Attempting %s (attempt %d/%d)",
+                        func.__name__,
+                        attempt,
+                        max_attempts,
                         operation="retry",
                     )
                     result = func(*args, **kwargs)
@@ -1,5 +1,7 @@
+import threading
+import weakref
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import yaml
 from pydantic import ValidationError
@@ -20,6 +22,41 @@ class ConfigManager:
     def __init__(self, path: str | Path = "config.yaml") -> None:
         self.path = Path(path)
         self._config: Optional[RootConfig] = None
+        self._listeners: list[weakref.WeakMethod] = []
+        # load_app's worker threads register listeners while requests notify
+        self._listeners_lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[RootConfig], None]) -> None:
+        """Call a bound method with the new config whenever it is updated or reloaded.
+
+        Held weakly, so components discarded on reload are not kept alive.
+        """
+        with self._listeners_lock:
+            self._listeners.append(weakref.WeakMethod(callback))
+
+    def _notify(self, config: RootConfig) -> None:
+        # Prune dead refs under the lock, but call back outside it so a
+        # listener may itself register listeners
+        with self._listeners_lock:
+            callbacks = [ref() for ref in self._listeners]
+            self._listeners = [
+                ref
+                for ref, callback in zip(self._listeners, callbacks)
+                if callback is not None
+            ]
+        for callback in callbacks:
+            if callback is None:
+                continue
+            try:
+                callback(config)
+            except Exception as exc:
+                # One failing component must not starve the rest or fail the
+                # update after the file is already written
+                logger.error(
+                    f"Config listener {callback.__qualname__} failed: {exc}",
+                    operation="notify-config",
+                    exc_info=True,
+                )
 
     def init(self, path: str | Path | None = None) -> RootConfig:
         """Initialise and load configuration from disk."""
@@ -48,7 +85,8 @@ class ConfigManager:
             raise ConfigError(f"Failed to write config: {exc}") from exc
 
         self._config = config
-        logger.info(f"Configuration written to {self.path}", "save-config")
+        self._notify(config)
+        logger.info("Configuration written to %s", self.path, operation="save-config")
 
     def reload(self) -> RootConfig:
         """Force re-read of the file and validate via Pydantic models."""
@@ -57,6 +95,7 @@ class ConfigManager:
             self._config = RootConfig.model_validate(raw)
         except ValidationError as exc:
             raise ConfigError(f"Invalid configuration: {exc}") from exc
+        self._notify(self._config)
         return self._config
 
     def get(self) -> RootConfig:
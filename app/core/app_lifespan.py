@@ -1,10 +1,8 @@
-import importlib
-import pkgutil
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.components.detection import pipelines
 from app.core import logging_config
 from app.core.initializer import Initializer
 
@@ -14,14 +12,11 @@ logger = logging_config.get_logger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Starting RealSense Vision...", operation="startup")
 
-    # Discover and register all pipelines automaticlly
-    for _, module_name, _ in pkgutil.iter_modules(pipelines.__path__):
-        if module_name == "pipeline_base":
-            continue
-        importlib.import_module(f"app.components.detection.pipelines.{module_name}")
-
     app.state.initializer = Initializer(app)
-    app.state.initializer.load_app()
+    # Camera bring-up and the NetworkTables connect block for seconds; keep
+    # them off the event loop. Component loops then run on the shared
+    # background loop rather than this one.
+    await asyncio.to_thread(app.state.initializer.load_app)
 
     logger.info("System startup complete", operation="startup", status="ready")
 
@@ -30,5 +25,5 @@ async def lifespan(app: FastAPI):
 
     # Shutdown section
     logger.info("Shutting down RealSense Vision", operation="shutdown")
-    app.state.initializer.stop_app()
+    await asyncio.to_thread(app.state.initializer.stop_app)
     logger.info("Shutdown complete", operation="shutdown")
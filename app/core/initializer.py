@@ -1,9 +1,14 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from fastapi import FastAPI
 
 from app.components.detection.pipeline_runner import PipelineRunner
-from app.components.detection.pipelines.pipeline_base import create_pipeline_by_name
+from app.components.detection.pipelines.pipeline_base import (
+    create_pipeline_by_name,
+    get_pipeline_class,
+)
 from app.components.detection.realsense_camera import (
     DISABLED_STREAM_IMAGE,
     RealSenseCamera,
@@ -19,37 +24,59 @@ from utils.utils import frames_to_jpeg_bytes
 logger = get_logger(__name__)
 
 
-class Initializer:
-    camera = None
-    runner = None
-    publisher = None
+@functools.lru_cache(maxsize=4)
+def _disabled_stream_jpeg(width: int, height: int) -> bytes:
+    """JPEG of the "Stream Disabled" placeholder, encoded once per resolution."""
+    return frames_to_jpeg_bytes(DISABLED_STREAM_IMAGE, resolution=(width, height))
 
+
+class Initializer:
     def __init__(self, app_instance: FastAPI) -> None:
         self.app_instance = app_instance
         self.config = ConfigManager().get()
+        self.camera: RealSenseCamera | None = None
+        self.pipeline = None
+        self.runner: PipelineRunner | None = None
+        self.publisher: NetworkTablesPublisher | None = None
 
     def load_app(self):
         logger.info("Starting application reload", operation="reload_app")
 
-        self.init_camera()
-        self.init_network_tables_component()
+        # Read and parse the config once per load; the components below and
+        # the stream routes all use these
+        self.config = ConfigManager().get()
+        width, height = map(int, self.config.camera.resolution.value.split("x"))
+        self.resolution = (width, height)
+
+        # Camera bring-up, the NetworkTables connect and loading the pipeline's
+        # model are independent blocking calls, so overlap them; the camera loop
+        # is started once they are all done.
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="init") as pool:
+            camera_init = pool.submit(self.init_camera)
+            publisher_init = pool.submit(self.init_network_tables_component)
+            pipeline_preload = pool.submit(self.preload_pipeline)
+            camera_init.result()
+            publisher_init.result()
+            pipeline_preload.result()
+        self.start_camera()
         self.setup_file_logging()
         self.init_pipeline_component()
         self.setup_stream_routes()
 
     def stop_app(self):
-        if self.runner:
-            self.runner.stop_sync()
+        self.stop_pipeline_component()
         if self.camera:
             self.camera.stop_pipeline()
-        streams.stop_all_streams()
         shutdown_background_loop()
+        logging_config.stop_file_logging()
 
     def init_camera(self):
         """Initialize camera component."""
-        resolution_str = ConfigManager().get().camera.resolution.value
-        width, height = list(map(int, resolution_str.split("x")))
-        self.camera = RealSenseCamera(width, height, ConfigManager().get().camera.fps)
+        width, height = self.resolution
+        self.camera = RealSenseCamera(width, height, self.config.camera.fps)
+
+    def start_camera(self):
+        """Start the camera loop if a device is connected."""
         if self.camera.is_connected():
             self.camera.start()
         else:
@@ -70,8 +97,35 @@ class Initializer:
             )
         logging_config.add_file_logging(f"logs/rs-vision-{date}-{match_string}.log")
 
+    def preload_pipeline(self):
+        """Load the configured pipeline's resources ahead of its construction."""
+        cls = get_pipeline_class(self.config.pipeline.type)
+        if cls is None:
+            return
+        try:
+            cls.preload(*self.config.pipeline.args)
+        except Exception as e:
+            # Construction retries the load and reports the failure properly
+            logger.warning(
+                "Preloading %s failed: %s",
+                self.config.pipeline.type,
+                e,
+                operation="reload_app",
+            )
+
+    def stop_pipeline_component(self):
+        """Stop the runner, then let the pipeline release its threads."""
+        if self.runner:
+            self.runner.stop_sync()
+            self.runner = None
+        if self.pipeline:
+            self.pipeline.close()
+            self.pipeline = None
+
     def init_pipeline_component(self):
         logger.info("Initializing pipeline runner", operation="reload_app")
+        # A reload replaces the previous pipeline; shut it down first
+        self.stop_pipeline_component()
 
         if self.camera is None:
             logger.warning(
@@ -83,6 +137,7 @@ class Initializer:
         try:
             self.pipeline = create_pipeline_by_name(self.config.pipeline, self.camera)
             assert self.pipeline
+            self.camera.align_depth = self.pipeline.needs_aligned_depth
 
             def _publish(output):
                 if self.publisher:
@@ -92,35 +147,55 @@ class Initializer:
             self.runner.start()
         except TypeError as e:
             logger.warning(
-                f"Incompatible number of arguments were passed to the pipeline {e}"
+                "Incompatible number of arguments were passed to the pipeline %s", e
             )
         except AssertionError:
-            logger.warning(f"Pipline named {self.config.pipeline} was not found.")
+            logger.warning("Pipline named %s was not found.", self.config.pipeline)
+
+    def get_raw_color_jpeg(self) -> bytes | None:
+        """JPEG of the camera's latest color frame, without annotations."""
+        frame = self.camera.latest_frame
+        if frame is None:
+            return None
+        return frames_to_jpeg_bytes(frame, resolution=self.resolution)
 
     def setup_stream_routes(self):
         logger.info("Configuring stream routes", operation="reload_app")
+        disabled_frame = _disabled_stream_jpeg(*self.resolution)
+
+        def frame_source(get_jpeg):
+            """Per-frame provider: the current source's JPEG, or the disabled frame."""
+
+            def video():
+                # Resolved per frame: routes outlive a reload, which replaces
+                # the runner and camera they read from
+                img = get_jpeg()
+                if img is None:
+                    return disabled_frame
+                return img
 
-        def video(depth: bool):
-            if not self.runner:
-                return DISABLED_STREAM_IMAGE
-            img = None
-            if depth:
-                img = self.runner.get_depth_jpeg()
-            else:
-                img = self.runner.get_color_jpeg()
-            if img is None:
-                return DISABLED_STREAM_IMAGE
-            return img
-
-        def video_color():
-            return video(False)
-
-        def video_depth():
-            return video(True)
-
-        streams.create_stream_route(self.app_instance, "/video_feed", video_color)
-        streams.create_stream_route(self.app_instance, "/depth_feed", video_depth)
-        streams.create_stream_route(self.app_instance, "/test_feed", lambda: frames_to_jpeg_bytes(self.camera.latest_frame))
+            return video
+
+        def color_jpeg():
+            runner = self.runner
+            return runner.get_color_jpeg() if runner else None
+
+        def depth_jpeg():
+            runner = self.runner
+            return runner.get_depth_jpeg() if runner else None
+
+        def raw_color_jpeg():
+            return self.get_raw_color_jpeg() if self.camera else None
+
+        streams.create_stream_route(
+            self.app_instance, "/video_feed", frame_source(color_jpeg)
+        )
+        streams.create_stream_route(
+            self.app_instance, "/depth_feed", frame_source(depth_jpeg)
+        )
+        streams.create_stream_route(
+            self.app_instance, "/test_feed", frame_source(raw_color_jpeg)
+        )
 
         logger.info(
             "Stream routes configured successfully",
@@ -5,7 +5,9 @@ Provides detailed, consistent logging across all components.
 
 import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from datetime import datetime
 from io import StringIO
@@ -15,6 +17,9 @@ import colorlog
 log_stream = StringIO()
 last_log: str = ""
 _root_logger: logging.Logger = None  # type: ignore
+_file_logging: list[
+    tuple[logging.handlers.QueueHandler, logging.handlers.QueueListener]
+] = []
 
 
 class StructuredFormatter(logging.Formatter):
@@ -74,40 +79,70 @@ class ComponentLogger:
         self.component_name = component_name
         self.logger = logging.getLogger(component_name)
 
+    def is_enabled_for(self, level) -> bool:
+        """Check the level before building an expensive message."""
+        return self.logger.isEnabledFor(level)
+
     def _log(
-        self, level, message, operation=None, status=None, exc_info=False, **kwargs
+        self,
+        level,
+        message,
+        *args,
+        operation=None,
+        status=None,
+        exc_info=False,
+        **kwargs,
     ):
+        # Positional args are %-style and only formatted if the record is
+        # emitted; skip building the context too when the level is off
+        if not self.logger.isEnabledFor(level):
+            return
         extra = {
             "component": self.component_name,
             "operation": operation,
             "status": status,
         }
         extra.update(kwargs)
-        self.logger.log(level, message, extra=extra, exc_info=exc_info)
+        self.logger.log(level, message, *args, extra=extra, exc_info=exc_info)
 
-    def debug(self, message, operation=None, **kwargs):
-        self._log(logging.DEBUG, message, operation=operation, **kwargs)
+    def debug(self, message, *args, operation=None, **kwargs):
+        self._log(logging.DEBUG, message, *args, operation=operation, **kwargs)
 
-    def info(self, message, operation=None, status="info", **kwargs):
-        self._log(logging.INFO, message, operation=operation, status=status, **kwargs)
+    def info(self, message, *args, operation=None, status="info", **kwargs):
+        self._log(
+            logging.INFO, message, *args, operation=operation, status=status, **kwargs
+        )
 
-    def warning(self, message, operation=None, status="warning", **kwargs):
+    def warning(self, message, *args, operation=None, status="warning", **kwargs):
         self._log(
-            logging.WARNING, message, operation=operation, status=status, **kwargs
+            logging.WARNING,
+            message,
+            *args,
+            operation=operation,
+            status=status,
+            **kwargs,
         )
 
-    def error(self, message, operation=None, status="error", **kwargs):
-        self._log(logging.ERROR, message, operation=operation, status=status, **kwargs)
+    def error(self, message, *args, operation=None, status="error", **kwargs):
+        self._log(
+            logging.ERROR, message, *args, operation=operation, status=status, **kwargs
+        )
 
-    def critical(self, message, operation=None, status="critical", **kwargs):
+    def critical(self, message, *args, operation=None, status="critical", **kwargs):
         self._log(
-            logging.CRITICAL, message, operation=operation, status=status, **kwargs
+            logging.CRITICAL,
+            message,
+            *args,
+            operation=operation,
+            status=status,
+            **kwargs,
         )
 
-    def exception(self, message, operation=None, **kwargs):
+    def exception(self, message, *args, operation=None, **kwargs):
         self._log(
             logging.ERROR,
             message,
+            *args,
             operation=operation,
             status="exception",
             exc_info=True,
@@ -176,16 +211,41 @@ def setup_logging(level=logging.INFO):
 
 
 def add_file_logging(log_file: str, level=logging.DEBUG):
+    """
+    Log to a file without blocking the caller on disk writes.
+
+    Records are formatted on the logging thread (so timestamps and tracebacks
+    are captured as they happen) and handed through a queue to a listener
+    thread that owns the file.
+    """
     try:
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(level)
-        file_handler.setFormatter(StructuredFormatter())
-        _root_logger.addHandler(file_handler)
+        # Opened on the first record rather than at startup
+        file_handler = logging.FileHandler(log_file, delay=True)
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        queue_handler.setLevel(level)
+        queue_handler.setFormatter(StructuredFormatter())
+
+        listener = logging.handlers.QueueListener(queue_handler.queue, file_handler)
+        listener.start()
+        _file_logging.append((queue_handler, listener))
+        _root_logger.addHandler(queue_handler)
     except Exception as e:
         _root_logger.exception(f"Failed to setup file logging to {log_file}: {e}")
 
 
+def stop_file_logging():
+    """Flush queued file records and stop the listener threads."""
+    while _file_logging:
+        queue_handler, listener = _file_logging.pop()
+        _root_logger.removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
 def set_root_level(level):
     if _root_logger:
         _root_logger.setLevel(level)
@@ -1,24 +1,14 @@
-from typing import NamedTuple
-
-
-class Point3d(NamedTuple):
-    x: float
-    y: float
-    z: float
-
-    def __str__(self) -> str:
-        return f"({round(self.x, 2)},{round(self.y, 2)},{round(self.z, 2)})"
-
-
-class Point2d(NamedTuple):
-    x: float
-    y: float
-
-    def __str__(self) -> str:
-        return f"({round(self.x, 2)},{round(self.y, 2)})"
-
-
-class Detection(NamedTuple):
-    point: Point3d
-    center: Point2d
-    depth: float
+import numpy as np
+
+# Flat per-detection record used on the hot path:
+# camera-frame point (x, y, z) in meters, pixel center (cx, cy), depth in meters.
+DETECTION_DTYPE = np.dtype(
+    [
+        ("x", np.float32),
+        ("y", np.float32),
+        ("z", np.float32),
+        ("cx", np.int32),
+        ("cy", np.int32),
+        ("depth", np.float32),
+    ]
+)
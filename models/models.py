@@ -30,8 +30,17 @@ class Filters(BaseModel):
     temporal: TemporalFilter
 
 
+class ColorExposure(BaseModel):
+    auto: bool = True
+    exposure: int = 156
+    gain: int = 64
+    # Stop auto exposure from lowering the frame rate in low light
+    hold_fps: bool = False
+
+
 class CameraSettings(BaseModel):
     filters: Filters
+    color_exposure: ColorExposure = ColorExposure()
     fps: int
     resolution: ResolutionEnum
 
@@ -60,6 +69,7 @@ class RootConfig(BaseModel):
     depth_frame: DepthFrame
     image_size: int
     min_confidence: float
+    detect_every: int = 1
     network_tables: NetworkTables
     pipeline: Pipeline
     chip_type: ChipType
@@ -73,6 +83,7 @@ default_config = RootConfig(
             spatial=SpatialFilter(enabled=True),
             temporal=TemporalFilter(enabled=True),
         ),
+        color_exposure=ColorExposure(auto=True, exposure=156, gain=64, hold_fps=False),
         fps=25,
         resolution=ResolutionEnum.r640x480,
     ),
@@ -80,6 +91,7 @@ default_config = RootConfig(
     depth_frame=DepthFrame(stream_enabled=True),
     image_size=640,
     min_confidence=0.85,
+    detect_every=1,
     network_tables=NetworkTables(
         server="10.59.87.2", table="AdvantageKit/RealsenseVision"
     ),
@@ -1,31 +1,43 @@
-from typing import Callable
+from typing import Sequence
 
 import cv2
+import numpy as np
 
-from models.detection_model import Detection
+ANNOTATION_COLOR = (0, 255, 255)
+TEXT_FONT = cv2.FONT_HERSHEY_SIMPLEX
+TEXT_SCALE = 0.7
+TEXT_THICKNESS = 2
+TEXT_OFFSET_Y = 10  # label baseline sits this many pixels above the center
+DOT_RADIUS = 5
+BOX_THICKNESS = 2
 
 
-def draw_depth_text(img, text, x, y, color=(0, 255, 255)):
+def draw_depth_text(img, text, x, y, color=ANNOTATION_COLOR):
     cv2.putText(
         img,
         text,
-        (x, y - 10),
-        cv2.FONT_HERSHEY_SIMPLEX,
-        0.7,
+        (x, y - TEXT_OFFSET_Y),
+        TEXT_FONT,
+        TEXT_SCALE,
         color,
-        2,
+        TEXT_THICKNESS,
     )
 
 
-def draw_center_dot(img, x, y, color=(0, 255, 255)):
-    cv2.circle(img, (x, y), 5, color, -1)
+def draw_center_dot(img, x, y, color=ANNOTATION_COLOR):
+    cv2.circle(img, (x, y), DOT_RADIUS, color, -1)
 
 
-def annotate_detections(img, detections, text_lambda: Callable[[Detection], str]):
-    for det in detections:
-        cx, cy = det.center.x, det.center.y
+def draw_boxes(img, boxes: np.ndarray, color=ANNOTATION_COLOR):
+    """Draw (N, 4) integer x_min, y_min, x_max, y_max boxes."""
+    for x_min, y_min, x_max, y_max in boxes.tolist():
+        cv2.rectangle(img, (x_min, y_min), (x_max, y_max), color, BOX_THICKNESS)
 
-        text = text_lambda(det)
 
+def annotate_detections(img, detections: np.ndarray, labels: Sequence[str]):
+    """Draw a label and center dot per detection; labels[i] belongs to detections[i]."""
+    for cx, cy, text in zip(
+        detections["cx"].tolist(), detections["cy"].tolist(), labels
+    ):
         draw_depth_text(img, text, cx, cy)
         draw_center_dot(img, cx, cy)
@@ -0,0 +1,74 @@
+import threading
+
+import cv2
+import numpy as np
+
+import app.core.logging_config as logging_config
+
+logger = logging_config.get_logger(__name__)
+TURBOJPEG = True
+try:
+    from turbojpeg import TJPF_BGR, TJPF_GRAY, TJSAMP_GRAY, TJSAMP_420, TurboJPEG
+except ImportError:
+    logger.warning("Cannot import PyTurboJPEG - falling back to cv2.imencode")
+    TURBOJPEG = False
+
+# Stream quality for both encoders; well below cv2's default of 95, which
+# roughly halves frame size and encode time with no visible loss on the feed.
+JPEG_QUALITY = 80
+
+# Single-pass baseline encode for the cv2 fallback.
+_CV2_JPEG_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY,
+    JPEG_QUALITY,
+    cv2.IMWRITE_JPEG_OPTIMIZE,
+    0,
+    cv2.IMWRITE_JPEG_PROGRESSIVE,
+    0,
+]
+
+_turbo = None
+_turbo_lock = threading.Lock()
+
+
+def _get_turbo():
+    """Create the TurboJPEG encoder on first use; None if libturbojpeg is missing."""
+    global _turbo, TURBOJPEG
+    if not TURBOJPEG:
+        return None
+    if _turbo is None:
+        with _turbo_lock:
+            if _turbo is None and TURBOJPEG:
+                try:
+                    _turbo = TurboJPEG()
+                except (OSError, RuntimeError) as e:
+                    logger.warning(
+                        f"Cannot load libturbojpeg ({e}) - falling back to cv2.imencode"
+                    )
+                    TURBOJPEG = False
+    return _turbo
+
+
+def turbo_encode(frame):
+    """Encode a BGR (or single-channel) frame to JPEG bytes, None on failure."""
+    frame = np.ascontiguousarray(frame)
+    turbo = _get_turbo()
+    if turbo is not None:
+        if frame.ndim == 2 or frame.shape[2] == 1:
+            return turbo.encode(
+                frame.reshape(frame.shape[0], frame.shape[1], 1),
+                quality=JPEG_QUALITY,
+                pixel_format=TJPF_GRAY,
+                jpeg_subsample=TJSAMP_GRAY,
+            )
+        return turbo.encode(
+            frame,
+            quality=JPEG_QUALITY,
+            pixel_format=TJPF_BGR,
+            jpeg_subsample=TJSAMP_420,
+        )
+
+    ret, jpeg = cv2.imencode(".jpg", frame, _CV2_JPEG_PARAMS)
+    if not ret:
+        return None
+    return jpeg.tobytes()
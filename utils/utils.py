@@ -4,13 +4,14 @@ import subprocess
 import cv2
 import numpy as np
 
+from utils.jpeg import turbo_encode
+
 
 def frames_to_jpeg_bytes(frame, resolution=(640, 480)):
-    resized = cv2.resize(frame, resolution)
-    ret, jpeg = cv2.imencode(".jpg", resized)
-    if not ret:
-        return None
-    return jpeg.tobytes()
+    # Frames normally already match the stream size; skip the full-frame copy
+    if (frame.shape[1], frame.shape[0]) != tuple(resolution):
+        frame = cv2.resize(frame, resolution)
+    return turbo_encode(frame)
 
 
 def unflatten_dict(flat, sep="."):